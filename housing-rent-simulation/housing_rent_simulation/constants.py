@@ -8,3 +8,5 @@ MIN_INCOME = 1500
 
 LANDLORD_WEIGHT = 2
 INCOME_WEIGHT = 3
+
+SEED = 42
@@ -1,76 +1,207 @@
-import random
+import multiprocessing
 
 import matplotlib.pyplot as plt
+import numpy as np
 
 from housing_rent_simulation.models.renter import Renter
 from housing_rent_simulation.models.property import Property
-from housing_rent_simulation.simulation.base import BaseSimulation
+from housing_rent_simulation.models.tables import (
+    PropertyTable,
+    RenterTable,
+    affordable_mask,
+)
+from housing_rent_simulation.simulation.base import BaseSimulation, SimulationResult
 from housing_rent_simulation.simulation.scenarios import (
     NoisyFairPriceSimulation,
     ActualFairPriceSimulation,
     NoisyFairPriceWithLandlordScoreSimulation,
     ActualFairPriceWithLandlordScoreSimulation,
 )
-from housing_rent_simulation.constants import MIN_RENT, MAX_RENT, MIN_INCOME, MAX_INCOME
+from housing_rent_simulation.constants import (
+    MIN_RENT,
+    MAX_RENT,
+    MIN_INCOME,
+    MAX_INCOME,
+    SEED,
+)
+
+
+def spawn_generators(
+    seed_sequence: np.random.SeedSequence, count: int
+) -> list[np.random.Generator]:
+    """Spawn independent Philox random number generators from a seed sequence."""
+    return [
+        np.random.Generator(np.random.Philox(child))
+        for child in seed_sequence.spawn(count)
+    ]
 
 
-def generate_random_renters(count: int) -> list[Renter]:
+def generate_random_renters(
+    count: int, rng: np.random.Generator | None = None
+) -> list[Renter]:
     """Generate a list of random renters."""
-    renters = []
-    for i in range(count):
-        min_price = MIN_RENT
-        income = random.uniform(MIN_INCOME, MAX_INCOME)
-        max_price = income / 3
-        job_stability = random.uniform(0.5, 1.0)
-        renters.append(
-            Renter(
-                id=i,
-                min_price=min_price,
-                max_price=max_price,
-                income=income,
-                job_stability=job_stability,
-            )
+    rng = rng or np.random.default_rng()
+    income = rng.uniform(MIN_INCOME, MAX_INCOME, count)
+    max_price = income / 3.0
+    job_stability = rng.uniform(0.5, 1.0, count)
+    return [
+        Renter(
+            id=i,
+            min_price=MIN_RENT,
+            max_price=max_price_i,
+            income=income_i,
+            job_stability=job_stability_i,
         )
-    return renters
+        for i, (income_i, max_price_i, job_stability_i) in enumerate(
+            zip(income.tolist(), max_price.tolist(), job_stability.tolist())
+        )
+    ]
 
 
-def generate_random_properties(count: int) -> list[Property]:
+def generate_random_properties(
+    count: int, rng: np.random.Generator | None = None
+) -> list[Property]:
     """Generate a list of random properties."""
-    properties = []
-    for i in range(count):
-        fair_price = random.uniform(MIN_RENT, MAX_RENT)
-        listed_price = random.uniform(fair_price * 0.9, fair_price * 1.1)
-        landlord_quality = random.uniform(0.0, 1.0)
-        properties.append(
-            Property(
-                id=i,
-                fair_price=fair_price,
-                listed_price=listed_price,
-                landlord_quality=landlord_quality,
-            )
+    rng = rng or np.random.default_rng()
+    fair_price = rng.uniform(MIN_RENT, MAX_RENT, count)
+    listed_price = rng.uniform(fair_price * 0.9, fair_price * 1.1)
+    landlord_quality = rng.uniform(0.0, 1.0, count)
+    Property.validate_batch(fair_price, listed_price, landlord_quality)
+    return [
+        Property(
+            id=i,
+            fair_price=fair_price_i,
+            listed_price=listed_price_i,
+            landlord_quality=landlord_quality_i,
+            validate=False,
         )
-    return properties
+        for i, (fair_price_i, listed_price_i, landlord_quality_i) in enumerate(
+            zip(fair_price.tolist(), listed_price.tolist(), landlord_quality.tolist())
+        )
+    ]
 
 
-def run_simulations(renters: list[Renter], properties: list[Property]) -> None:
-    """Run all simulation scenarios and display results."""
-    scenarios: list[tuple[str, BaseSimulation]] = [
+def _run_scenario(
+    simulation_type: type[BaseSimulation],
+    renters: list[Renter],
+    properties: list[Property],
+    **kwargs,
+) -> tuple[SimulationResult, np.ndarray]:
+    """Match renters to properties and compute the average ranks of a scenario."""
+    simulation = simulation_type(renters, properties, **kwargs)
+    result = simulation.match_renters_to_properties()
+    return result, simulation.get_average_rank()
+
+
+def _run_scenario_from_columns(
+    simulation_type: type[BaseSimulation],
+    renter_columns: tuple[np.ndarray, ...],
+    property_columns: tuple[np.ndarray, ...],
+    kwargs: dict,
+) -> tuple[SimulationResult, np.ndarray]:
+    """
+    Run a scenario in a worker process.
+
+    Only the columns of the renter and property tables are sent to the worker,
+    which rebuilds the renters and properties from them.
+
+    Args:
+        simulation_type: Simulation class of the scenario
+        renter_columns: Id, min price, max price, income and job stability of
+            the renters
+        property_columns: Id, fair price, listed price and landlord quality of
+            the properties
+        kwargs: Further arguments of the simulation
+
+    Returns:
+        Result and average ranks of the scenario
+    """
+    renters = [Renter(*row) for row in zip(*(c.tolist() for c in renter_columns))]
+    properties = [
+        Property(*row, validate=False)
+        for row in zip(*(c.tolist() for c in property_columns))
+    ]
+    return _run_scenario(simulation_type, renters, properties, **kwargs)
+
+
+def run_simulations(
+    renters: list[Renter],
+    properties: list[Property],
+    seed_sequence: np.random.SeedSequence | None = None,
+    processes: int = 1,
+) -> None:
+    """
+    Run all simulation scenarios and display results.
+
+    Args:
+        renters: List of renters in the market
+        properties: List of properties in the market
+        seed_sequence: Seed of the random streams of the scenarios
+        processes: Number of worker processes to run the scenarios in. Starting
+            the workers takes seconds, so this only pays off for large markets;
+            the scenarios run in this process by default
+    """
+    # Every scenario gets its own random stream
+    rngs = spawn_generators(seed_sequence or np.random.SeedSequence(), 4)
+
+    # The market is the same in every scenario, check affordability only once
+    renter_table = RenterTable.from_list(renters)
+    property_table = PropertyTable.from_list(properties)
+    affordable = affordable_mask(
+        renter_table.min_cents, renter_table.max_cents, property_table.listed_cents
+    )
+    scenarios: list[tuple[str, type[BaseSimulation], dict]] = [
         (
             "Noisy Fair Price",
-            NoisyFairPriceSimulation(renters, properties, noise_level=0.1),
+            NoisyFairPriceSimulation,
+            dict(noise_level=0.1, rng=rngs[0]),
         ),
-        ("Actual Fair Price", ActualFairPriceSimulation(renters, properties)),
+        ("Actual Fair Price", ActualFairPriceSimulation, dict(rng=rngs[1])),
         (
             "Noisy Fair Price + Landlord Score",
-            NoisyFairPriceWithLandlordScoreSimulation(
-                renters, properties, noise_level=0.1
-            ),
+            NoisyFairPriceWithLandlordScoreSimulation,
+            dict(noise_level=0.1, rng=rngs[2]),
         ),
         (
             "Actual Fair Price + Landlord Score",
-            ActualFairPriceWithLandlordScoreSimulation(renters, properties),
+            ActualFairPriceWithLandlordScoreSimulation,
+            dict(rng=rngs[3]),
         ),
     ]
+    for _, _, kwargs in scenarios:
+        kwargs["affordable"] = affordable
+
+    if processes > 1:
+        # Workers are spawned rather than forked since the Numba threading
+        # layer is not fork-safe; they load the compiled kernels from the
+        # on-disk cache
+        renter_columns = (
+            renter_table.id,
+            renter_table.min_price,
+            renter_table.max_price,
+            renter_table.income,
+            renter_table.job_stability,
+        )
+        property_columns = (
+            property_table.id,
+            property_table.fair_price,
+            property_table.listed_price,
+            property_table.landlord_quality,
+        )
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(min(processes, len(scenarios))) as pool:
+            outcomes = pool.starmap(
+                _run_scenario_from_columns,
+                [
+                    (simulation_type, renter_columns, property_columns, kwargs)
+                    for _, simulation_type, kwargs in scenarios
+                ],
+            )
+    else:
+        outcomes = [
+            _run_scenario(simulation_type, renters, properties, **kwargs)
+            for _, simulation_type, kwargs in scenarios
+        ]
 
     print("\nHousing Rent Simulation Results")
     print("=" * 50)
@@ -87,36 +218,24 @@ def run_simulations(renters: list[Renter], properties: list[Property]) -> None:
         fontsize=16,
     )
 
-    for idx, (name, simulation) in enumerate(scenarios, 1):
-        # Run the simulation to get assignments
-        result = simulation.match_renters_to_properties()
-
-        # Get average ranks
-        avg_ranks = simulation.get_average_rank()
-
-        # landlord score vs average rank
-        landlord_scores, average_ranks = [], []
-        for _id, avg_rank in avg_ranks.items():
-            landlord_scores.append(simulation.properties_map[_id].landlord_quality)
-            average_ranks.append(avg_rank)
-
+    for idx, ((name, _, _), (result, avg_ranks)) in enumerate(
+        zip(scenarios, outcomes), 1
+    ):
         # Create subplot for rank vs quality
         ax1 = figure1.add_subplot(2, 2, idx)
-        ax1.scatter(landlord_scores, average_ranks, alpha=0.6)
+        ax1.scatter(property_table.landlord_quality, avg_ranks, alpha=0.6)
         ax1.set_title(name)
         ax1.set_xlabel("Landlord Quality Score")
         ax1.set_ylabel("Average Rank")
         ax1.grid(True, alpha=0.3)
 
         # landlord score vs max possible rent
-        landlord_scores, max_rents = [], []
-        combined_results = []
-        for assignment in result.assignments:
-            _property = simulation.properties_map[assignment.property_id]
-            renter = simulation.renters_map[assignment.renter_id]
-            combined_results.append((_property.landlord_quality, renter.max_price))
-        combined_results.sort(key=lambda x: x[0])
-        landlord_scores, max_rents = zip(*combined_results)
+        landlord_scores = property_table.landlord_quality[
+            property_table.index_of(result.property_ids)
+        ]
+        max_rents = renter_table.max_price[renter_table.index_of(result.renter_ids)]
+        order = np.argsort(landlord_scores, kind="stable")
+        landlord_scores, max_rents = landlord_scores[order], max_rents[order]
 
         # Create subplot for max rent vs quality
         ax2 = figure2.add_subplot(2, 2, idx)
@@ -147,9 +266,11 @@ def run_debug():
     simulation = ActualFairPriceWithLandlordScoreSimulation(renters, properties)
     result = simulation.match_renters_to_properties()
 
-    for assignment in result.assignments:
-        renter = simulation.renters_map[assignment.renter_id]
-        _property = simulation.properties_map[assignment.property_id]
+    renter_rows = simulation.renter_table.index_of(result.renter_ids)
+    property_rows = simulation.property_table.index_of(result.property_ids)
+    for assignment, i, j in zip(result.assignments, renter_rows, property_rows):
+        renter = simulation.renters[i]
+        _property = simulation.properties[j]
         print(
             f"assigning renter {assignment.renter_id} to property {assignment.property_id}: {renter.max_price} - {_property.landlord_quality}"
         )
@@ -162,29 +283,32 @@ def run_debug2():
     simulation = ActualFairPriceWithLandlordScoreSimulation(renters, properties)
     result = simulation.match_renters_to_properties()
 
-    values = []
-    for assignment in result.assignments:
-        renter = simulation.renters_map[assignment.renter_id]
-        _property = simulation.properties_map[assignment.property_id]
-        values.append(
-            (renter.id, _property.id, renter.max_price, _property.landlord_quality)
-        )
+    renter_table = simulation.renter_table
+    property_table = simulation.property_table
+    renter_ids = result.renter_ids
+    property_ids = result.property_ids
+    max_prices = renter_table.max_price[renter_table.index_of(renter_ids)]
+    landlord_qualities = property_table.landlord_quality[
+        property_table.index_of(property_ids)
+    ]
 
-    values.sort(key=lambda x: x[3])
-    for renter_id, property_id, max_price, landlord_quality in values:
+    for k in np.argsort(landlord_qualities):
         print(
-            f"assigning renter {renter_id} to property {property_id}: {max_price} - {landlord_quality}"
+            f"assigning renter {renter_ids[k]} to property {property_ids[k]}: {max_prices[k]} - {landlord_qualities[k]}"
         )
 
 
-def main():
+def main(seed: int | None = SEED):
     """Main entry point for the simulation."""
+    seed_sequence = np.random.SeedSequence(seed)
+    renter_rng, property_rng = spawn_generators(seed_sequence, 2)
+
     # Generate random renters and properties
-    renters = generate_random_renters(200)
-    properties = generate_random_properties(180)
+    renters = generate_random_renters(200, renter_rng)
+    properties = generate_random_properties(180, property_rng)
 
     # Run all simulation scenarios
-    run_simulations(renters, properties)
+    run_simulations(renters, properties, seed_sequence)
 
 
 if __name__ == "__main__":
@@ -2,5 +2,20 @@
 
 from .renter import Renter
 from .property import Property
+from .prices import to_cents
+from .tables import (
+    RenterTable,
+    PropertyTable,
+    affordable_mask,
+    precompute_observed_prices,
+)
 
-__all__ = ["Renter", "Property"]
+__all__ = [
+    "Renter",
+    "Property",
+    "RenterTable",
+    "PropertyTable",
+    "affordable_mask",
+    "precompute_observed_prices",
+    "to_cents",
+]
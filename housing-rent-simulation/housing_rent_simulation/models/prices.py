@@ -0,0 +1,25 @@
+import numpy as np
+
+# Range of the cents representation. Larger prices, infinite ones included,
+# saturate, so an unbounded maximum price stays above every realistic price
+MIN_CENTS = -(2**31 - 1)
+MAX_CENTS = 2**31 - 1
+
+
+def to_cents(prices: np.ndarray | float) -> np.ndarray:
+    """
+    Round prices to whole cents.
+
+    Args:
+        prices: Prices in currency units
+
+    Returns:
+        Prices in cents as 32-bit integers, clipped to [MIN_CENTS, MAX_CENTS]
+
+    Raises:
+        ValueError: If a price is NaN
+    """
+    cents = np.rint(np.asarray(prices, dtype=np.float64) * 100)
+    if np.isnan(cents).any():
+        raise ValueError("Prices must not be NaN")
+    return np.clip(cents, MIN_CENTS, MAX_CENTS).astype(np.int32)
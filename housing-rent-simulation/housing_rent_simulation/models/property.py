@@ -1,9 +1,13 @@
-from dataclasses import dataclass
-from typing import Optional
-import random
+from dataclasses import InitVar, dataclass, field
+from typing import TYPE_CHECKING, Optional
 
+import numpy as np
 
-@dataclass
+if TYPE_CHECKING:
+    from housing_rent_simulation.models.renter import Renter
+
+
+@dataclass(slots=True)
 class Property:
     """Represents a property in the housing market simulation."""
 
@@ -12,9 +16,19 @@ class Property:
     listed_price: float
     landlord_quality: float  # Score between 0 and 1
     max_possible_price: Optional[float] = None
+    assigned_renter: Optional["Renter"] = field(default=None, repr=False, compare=False)
+    validate: InitVar[bool] = True
+
+    def __post_init__(self, validate: bool):
+        """
+        Validate the property attributes after initialization.
 
-    def __post_init__(self):
-        """Validate the property attributes after initialization."""
+        Args:
+            validate: Whether to validate, False when the attributes were
+                already checked with `validate_batch`
+        """
+        if not validate:
+            return
         if not 0 <= self.landlord_quality <= 1:
             raise ValueError("Landlord quality must be between 0 and 1")
         if self.listed_price <= 0:
@@ -22,17 +36,40 @@ class Property:
         if self.fair_price <= 0:
             raise ValueError("Fair price must be positive")
 
-    def get_observed_price(self, noise_level: float = 0.0) -> float:
+    @staticmethod
+    def validate_batch(
+        fair_price: np.ndarray, listed_price: np.ndarray, landlord_quality: np.ndarray
+    ) -> None:
+        """
+        Validate the attributes of many properties at once.
+
+        Args:
+            fair_price: Fair price of each property
+            listed_price: Listed price of each property
+            landlord_quality: Landlord quality score of each property
+        """
+        if not ((0 <= landlord_quality) & (landlord_quality <= 1)).all():
+            raise ValueError("Landlord quality must be between 0 and 1")
+        if not (listed_price > 0).all():
+            raise ValueError("Listed price must be positive")
+        if not (fair_price > 0).all():
+            raise ValueError("Fair price must be positive")
+
+    def get_observed_price(
+        self, noise_level: float = 0.0, rng: np.random.Generator | None = None
+    ) -> float:
         """
         Get the observed price of the property with optional noise.
 
         Args:
             noise_level: Amount of noise to add to the fair price
+            rng: Random number generator to draw the noise from
 
         Returns:
             Observed price with noise if noise_level > 0, otherwise fair price
         """
         if noise_level > 0:
-            noise = random.gauss(0, noise_level * self.fair_price)
+            rng = rng or np.random.default_rng()
+            noise = rng.normal(0.0, noise_level * self.fair_price)
             return self.fair_price + noise
         return self.fair_price
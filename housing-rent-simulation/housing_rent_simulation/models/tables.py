@@ -0,0 +1,243 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from housing_rent_simulation.constants import MAX_INCOME, MIN_INCOME, INCOME_WEIGHT
+from housing_rent_simulation.models.prices import to_cents
+from housing_rent_simulation.models.renter import Renter
+from housing_rent_simulation.models.property import Property
+
+
+@dataclass
+class RenterTable:
+    """
+    Column-wise (structure of arrays) view of a list of renters.
+
+    `assigned` holds the row of the property assigned to each renter in the
+    matching PropertyTable, -1 if none.
+    """
+
+    id: np.ndarray
+    min_price: np.ndarray
+    max_price: np.ndarray
+    income: np.ndarray
+    job_stability: np.ndarray
+    attractiveness: np.ndarray = field(init=False)
+    priority: np.ndarray = field(init=False)
+    min_cents: np.ndarray = field(init=False)
+    max_cents: np.ndarray = field(init=False)
+    assigned: np.ndarray = field(init=False)
+    _index: "_IdIndex" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Calculate the attractiveness score and priority order of every renter.
+
+        The score is the normalized income weighted by INCOME_WEIGHT plus the
+        job stability. The priority order lists the rows from the most to the
+        least attractive renter, ties keeping the row order. The price bounds
+        are also kept in integer cents for the affordability checks. No renter
+        is assigned a property yet.
+        """
+        normalized_income = (self.income - MIN_INCOME) / (MAX_INCOME - MIN_INCOME)
+        self.attractiveness = normalized_income * INCOME_WEIGHT + self.job_stability
+        self.priority = np.argsort(-self.attractiveness, kind="stable")
+        self.min_cents = to_cents(self.min_price)
+        self.max_cents = to_cents(self.max_price)
+        self.assigned = np.full(len(self.id), -1, dtype=np.int64)
+        self._index = _IdIndex.build(self.id)
+
+    @classmethod
+    def from_list(cls, renters: list[Renter]) -> "RenterTable":
+        """
+        Stack the attributes of the given renters into parallel arrays.
+
+        Args:
+            renters: List of renters, the row order of the table
+
+        Returns:
+            RenterTable with one row per renter
+        """
+        n = len(renters)
+        return cls(
+            id=np.fromiter((r.id for r in renters), dtype=np.int64, count=n),
+            min_price=np.fromiter(
+                (r.min_price for r in renters), dtype=np.float64, count=n
+            ),
+            max_price=np.fromiter(
+                (r.max_price for r in renters), dtype=np.float64, count=n
+            ),
+            income=np.fromiter((r.income for r in renters), dtype=np.float64, count=n),
+            job_stability=np.fromiter(
+                (r.job_stability for r in renters), dtype=np.float64, count=n
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def index_of(self, ids: np.ndarray) -> np.ndarray:
+        """Get the row of each of the given ids, KeyError if one is unknown."""
+        return self._index.lookup(self.id, ids)
+
+
+@dataclass
+class PropertyTable:
+    """
+    Column-wise (structure of arrays) view of a list of properties.
+
+    `assigned` holds the row of the renter assigned to each property in the
+    matching RenterTable, -1 if none.
+    """
+
+    id: np.ndarray
+    fair_price: np.ndarray
+    listed_price: np.ndarray
+    landlord_quality: np.ndarray
+    listed_cents: np.ndarray = field(init=False)
+    assigned: np.ndarray = field(init=False)
+    _index: "_IdIndex" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Keep the listed prices in integer cents for the affordability checks.
+
+        No property is assigned to a renter yet.
+        """
+        self.listed_cents = to_cents(self.listed_price)
+        self.assigned = np.full(len(self.id), -1, dtype=np.int64)
+        self._index = _IdIndex.build(self.id)
+
+    @classmethod
+    def from_list(cls, properties: list[Property]) -> "PropertyTable":
+        """
+        Stack the attributes of the given properties into parallel arrays.
+
+        Args:
+            properties: List of properties, the row order of the table
+
+        Returns:
+            PropertyTable with one row per property
+        """
+        n = len(properties)
+        return cls(
+            id=np.fromiter((p.id for p in properties), dtype=np.int64, count=n),
+            fair_price=np.fromiter(
+                (p.fair_price for p in properties), dtype=np.float64, count=n
+            ),
+            listed_price=np.fromiter(
+                (p.listed_price for p in properties), dtype=np.float64, count=n
+            ),
+            landlord_quality=np.fromiter(
+                (p.landlord_quality for p in properties), dtype=np.float32, count=n
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def index_of(self, ids: np.ndarray) -> np.ndarray:
+        """Get the row of each of the given ids, KeyError if one is unknown."""
+        return self._index.lookup(self.id, ids)
+
+
+@dataclass(frozen=True)
+class _IdIndex:
+    """
+    Lookup of the position of ids in an array of unique ids.
+
+    Small non-negative ids, e.g. 0..N-1, map to their position through a dense
+    array; other ids are found by a binary search over their sort order.
+    """
+
+    rows: np.ndarray
+    dense: bool
+
+    @classmethod
+    def build(cls, table_ids: np.ndarray) -> "_IdIndex":
+        """Build the lookup of an array of unique ids."""
+        n = len(table_ids)
+        if n and table_ids.min() >= 0 and table_ids.max() < 2 * n:
+            rows = np.full(table_ids.max() + 1, -1, dtype=np.int64)
+            rows[table_ids] = np.arange(n)
+            return cls(rows=rows, dense=True)
+        return cls(rows=np.argsort(table_ids), dense=False)
+
+    def lookup(self, table_ids: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """
+        Get the position of each of the given ids in `table_ids`.
+
+        Raises:
+            KeyError: If an id is not in `table_ids`
+        """
+        ids = np.asarray(ids)
+        if self.dense:
+            found = (ids >= 0) & (ids < len(self.rows))
+            rows = self.rows[np.where(found, ids, 0)]
+            found &= rows >= 0
+        elif len(table_ids):
+            positions = np.searchsorted(table_ids, ids, sorter=self.rows)
+            rows = self.rows[np.minimum(positions, len(table_ids) - 1)]
+            found = table_ids[rows] == ids
+        else:
+            rows = np.zeros(ids.shape, dtype=np.int64)
+            found = np.zeros(ids.shape, dtype=bool)
+        if not found.all():
+            raise KeyError(f"Unknown ids {ids[~found].tolist()}")
+        return rows
+
+
+def affordable_mask(
+    min_price: np.ndarray | float, max_price: np.ndarray | float, price: np.ndarray
+) -> np.ndarray:
+    """
+    Check which prices each renter can afford.
+
+    The prices can be given in any unit, e.g. integer cents (see `to_cents`),
+    which makes the comparisons cheaper than on floats.
+
+    Args:
+        min_price: Minimum price of each renter (or of a single renter)
+        max_price: Maximum price of each renter (or of a single renter)
+        price: Listed price of each property
+
+    Returns:
+        Boolean matrix of shape (renters, properties), or a vector of shape
+        (properties,) when a single renter's bounds are given
+    """
+    lower = np.asarray(min_price)[..., np.newaxis]
+    upper = np.asarray(max_price)[..., np.newaxis]
+    return (lower <= price) & (price <= upper)
+
+
+def precompute_observed_prices(
+    properties: PropertyTable,
+    noise_level: float,
+    rng: np.random.Generator,
+    n_draws: int | None = None,
+) -> np.ndarray:
+    """
+    Draw the observed price of every property in a single batch.
+
+    Args:
+        properties: Table of the properties to observe
+        noise_level: Standard deviation of the noise as a fraction of fair price
+        rng: Random number generator to draw the noise from
+        n_draws: Number of independent observations of every property, e.g. one
+            per renter; a single observation if not given
+
+    Returns:
+        Single precision observed prices aligned with the rows of the table, of
+        shape (properties,) or (n_draws, properties)
+    """
+    fair_price = properties.fair_price.astype(np.float32)
+    size = fair_price.shape if n_draws is None else (n_draws, len(fair_price))
+    if noise_level > 0:
+        # Turn the noise into the observed prices in place, so a (draws,
+        # properties) batch needs no temporaries of the same size
+        observed = rng.standard_normal(size, dtype=np.float32)
+        observed *= noise_level
+        observed += 1
+        observed *= fair_price
+        return observed
+    return np.broadcast_to(fair_price, size)
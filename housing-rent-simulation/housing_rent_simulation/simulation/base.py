@@ -1,11 +1,32 @@
 from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
 from housing_rent_simulation.models.renter import Renter
 from housing_rent_simulation.models.property import Property
+from housing_rent_simulation.models.tables import (
+    PropertyTable,
+    RenterTable,
+    affordable_mask,
+    to_cents,
+)
+from housing_rent_simulation.simulation.kernels import (
+    affordable_order,
+    rank_by_affordability,
+    rank_by_score,
+)
+from housing_rent_simulation.simulation.matching import MATCHERS
 
 
 @dataclass
 class SimulationResult:
-    """Results of a simulation run."""
+    """
+    Results of a simulation run.
+
+    The assignments are stored column-wise, entry k of every array describing
+    the k-th assignment.
+    """
 
     @dataclass
     class Assignment:
@@ -15,35 +36,114 @@ class SimulationResult:
         renter_id: int
         price: float
 
-    assignments: list[Assignment]
+    property_ids: np.ndarray
+    renter_ids: np.ndarray
+    prices: np.ndarray
+
+    @property
+    def assignments(self) -> list[Assignment]:
+        """Get the assignments as individual records."""
+        return [
+            SimulationResult.Assignment(
+                property_id=property_id, renter_id=renter_id, price=price
+            )
+            for property_id, renter_id, price in zip(
+                self.property_ids.tolist(),
+                self.renter_ids.tolist(),
+                self.prices.tolist(),
+            )
+        ]
+
+    @property
+    def total_assignments(self) -> int:
+        """Get the number of assignments."""
+        return len(self.prices)
+
+    @property
+    def total_revenue(self) -> float:
+        """Get the sum of the prices of all assignments."""
+        return float(self.prices.sum())
+
+    @property
+    def average_price(self) -> float:
+        """Get the average price of the assignments, 0 if there are none."""
+        return float(self.prices.mean()) if len(self.prices) else 0.0
 
 
 class BaseSimulation:
     """Base class for housing market simulations."""
 
-    def __init__(self, renters: list[Renter], properties: list[Property]):
+    # Scoring rule of the scenario: maps the observed prices and the landlord
+    # quality of properties, broadcastable against each other, to scores
+    # (higher is better)
+    score_fn: Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+    def __init__(
+        self,
+        renters: list[Renter],
+        properties: list[Property],
+        matcher: str = "hungarian",
+        rng: np.random.Generator | None = None,
+        affordable: np.ndarray | None = None,
+    ):
         """
         Initialize the simulation with renters and properties.
 
         Args:
             renters: List of renters in the simulation
             properties: List of properties in the simulation
+            matcher: Name of the matching algorithm, one of `MATCHERS`
+            rng: Random number generator for the random parts of the scenario
+            affordable: Precomputed affordability matrix of the renters and
+                properties, e.g. shared between scenarios; computed if not given
         """
+        if matcher not in MATCHERS:
+            raise ValueError(f"Unknown matcher {matcher!r}")
+        self.matcher = matcher
+        self.rng = rng or np.random.default_rng()
         self.renters = renters
-        self.renters_map = {r.id: r for r in renters}
         self.properties = properties
-        self.properties_map = {p.id: p for p in properties}
+        self.renter_table = RenterTable.from_list(renters)
+        self.property_table = PropertyTable.from_list(properties)
+        self._fair_price = self.property_table.fair_price.astype(np.float32)
+        if affordable is None:
+            affordable = affordable_mask(
+                self.renter_table.min_cents,
+                self.renter_table.max_cents,
+                self.property_table.listed_cents,
+            )
+        elif affordable.shape != (len(renters), len(properties)):
+            raise ValueError("Affordability matrix does not match the market")
+        self._affordable = affordable
         self._reset_simulation()
 
-    def _get_scored_property(
-        self, renter: Renter, _property: Property
-    ) -> tuple[float, Property]:
+    def _observed_prices(self) -> np.ndarray:
         """
-        Get the scored property for a given renter.
+        Get the prices of the properties as observed by the renters.
+
+        Returns:
+            Observed prices of shape (properties,) when all renters observe the
+            same prices, otherwise of shape (renters, properties)
+        """
+        return self._fair_price
+
+    def _score_row(self, renter: Renter) -> np.ndarray:
+        """
+        Score every property for a given renter.
+
+        Args:
+            renter: The renter to score the properties for
+
+        Returns:
+            Single precision scores aligned with `self.properties`
         """
-        raise NotImplementedError("Subclasses must implement this method.")
+        prices = self._observed_prices()
+        if prices.ndim == 2:
+            prices = prices[self.renter_table.index_of(renter.id)]
+        scores = self.score_fn(prices, self.property_table.landlord_quality)
+        return scores.astype(np.float32, copy=False)
 
-    def get_ranked_properties(self, renter: Renter) -> list[tuple[float, Property]]:
+    def get_ranked_properties(self, renter: Renter) -> list[Property]:
         """
         Get properties sorted by their score for a given renter.
 
@@ -51,87 +151,84 @@ class BaseSimulation:
             renter: The renter to get the scored properties for
 
         Returns:
-            List of properties sorted by their score
-        """
-        scored_properties = sorted(
-            [
-                self._get_scored_property(renter, _property)
-                for _property in self.properties
-                if renter.can_afford(_property.listed_price)
-            ],
-            key=lambda x: x[0],
-            reverse=True,
+            List of the properties the renter can afford, sorted by their score
+        """
+        order = affordable_order(
+            self._score_row(renter),
+            self.property_table.listed_cents,
+            to_cents(renter.min_price),
+            to_cents(renter.max_price),
         )
 
-        return [property for _, property in scored_properties]
+        return [self.properties[j] for j in order]
 
     def _reset_simulation(self) -> None:
         """Reset the simulation state."""
+        self._property_ranks: np.ndarray | None = None
+        self._renter_ranks: np.ndarray | None = None
+        self.renter_table.assigned.fill(-1)
+        self.property_table.assigned.fill(-1)
         for renter in self.renters:
             renter.assigned_property = None
         for _property in self.properties:
             _property.assigned_renter = None
             _property.max_possible_price = None
 
-    def _get_property_ranks(self) -> dict[int, dict[int, int]]:
+    def _score_matrix(self) -> np.ndarray:
         """
-        Get the ranks of each property for each renter.
+        Score every affordable property for every renter.
 
         Returns:
-            Dictionary mapping property IDs to dictionaries of renter IDs to ranks
+            Matrix of shape (renters, properties), -inf where not affordable
         """
-        ranks: dict[int, dict[int, int]] = {p.id: {} for p in self.properties}
-
-        for renter in self.renters:
-            ranked_properties = self.get_ranked_properties(renter)
-            for i, _property in enumerate(ranked_properties):
-                ranks[_property.id][renter.id] = i
-
-        return ranks
+        scores = self.score_fn(
+            self._observed_prices(), self.property_table.landlord_quality
+        )
+        return np.where(self._affordable, scores, -np.inf)
 
-    def get_average_rank(self) -> dict[int, float]:
+    def _get_property_ranks(self) -> np.ndarray:
         """
-        Get the average rank of each property.
+        Get the rank of each property for each renter, computed once per run.
+
+        Returns:
+            Matrix of shape (renters, properties), -1 where not affordable
         """
-        ranks = self._get_property_ranks()
-        return {
-            property_id: sum(ranks[property_id].values())
-            / (len(ranks[property_id]) + 1e-6)
-            for property_id in ranks
-        }
+        if self._property_ranks is None:
+            scores = self._score_matrix().astype(np.float32, copy=False)
+            self._property_ranks = rank_by_score(scores, self._affordable)
+        return self._property_ranks
 
-    def _get_renter_ranks(self) -> dict[int, dict[int, int]]:
+    def _get_renter_ranks(self) -> np.ndarray:
         """
-        Get the ranks of each renter for each property they can afford.
+        Get the rank of each renter for each property, computed once per run.
 
         Returns:
-            Dictionary mapping renter IDs to dictionaries of property IDs to ranks
+            Matrix of shape (renters, properties), -1 where not affordable
         """
-        renter_ranks: dict[int, dict[int, int]] = {r.id: {} for r in self.renters}
-
-        for _property in self.properties:
-            # Get all renters who can afford this property
-            eligible_renters = [
-                renter
-                for renter in self.renters
-                if renter.can_afford(_property.listed_price)
-            ]
-
-            # Sort renters by their score for this property
-            scored_renters = sorted(
-                [
-                    (renter.calculate_attractiveness_score(), renter)
-                    for renter in eligible_renters
-                ],
-                key=lambda x: x[0],
-                reverse=True,
+        if self._renter_ranks is None:
+            # Every property ranks its eligible renters by the same score, so
+            # the kernel walks the renters in their precomputed priority order
+            self._renter_ranks = rank_by_affordability(
+                self.renter_table.priority, self._affordable
             )
+        return self._renter_ranks
 
-            # Record ranks
-            for i, (_, renter) in enumerate(scored_renters):
-                renter_ranks[renter.id][_property.id] = i
+    def get_average_rank(self) -> np.ndarray:
+        """
+        Get the average rank of each property.
 
-        return renter_ranks
+        Returns:
+            Average rank over the renters who can afford each property, aligned
+            with `self.properties`
+        """
+        property_ranks = self._get_property_ranks()
+        rows, cols = np.nonzero(self._affordable)
+        n_properties = len(self.properties)
+        rank_sums = np.bincount(
+            cols, weights=property_ranks[rows, cols], minlength=n_properties
+        )
+        counts = np.bincount(cols, minlength=n_properties)
+        return rank_sums / (counts + 1e-6)
 
     def match_renters_to_properties(self) -> SimulationResult:
         """
@@ -141,54 +238,29 @@ class BaseSimulation:
             SimulationResult containing the assignments and statistics
         """
 
-        # Get ranks for both properties and renters
-        property_ranks = self._get_property_ranks()
-        renter_ranks = self._get_renter_ranks()
-
-        # Create a list of all possible assignments with their combined rank
-        possible_assignments = []
-        for renter in self.renters:
-            for _property in self.properties:
-                if renter.can_afford(_property.listed_price):
-                    # Calculate combined rank (lower is better)
-                    property_rank = property_ranks.get(_property.id, dict()).get(
-                        renter.id, float("inf") - 1000
-                    )
-                    renter_rank = renter_ranks.get(renter.id, dict()).get(
-                        _property.id, float("inf") - 1000
-                    )
-                    combined_rank = property_rank + renter_rank
-
-                    possible_assignments.append((combined_rank, renter, _property))
-
-        # Sort assignments by combined rank
-        possible_assignments.sort(key=lambda x: x[0])
+        # Calculate the combined rank of every possible assignment (lower is better)
+        combined_ranks = np.where(
+            self._affordable,
+            self._get_property_ranks() + self._get_renter_ranks(),
+            0,
+        ).astype(np.int32, copy=False)
 
         # Make assignments
-        assignments = []
-        assigned_renters = set()
-        assigned_properties = set()
-
-        for _, renter, _property in possible_assignments:
-            if (
-                renter.id not in assigned_renters
-                and _property.id not in assigned_properties
-            ):
-
-                # Make the assignment
-                renter.assigned_property = _property
-                _property.assigned_renter = renter
-                _property.max_possible_price = renter.max_price
-
-                assignments.append(
-                    SimulationResult.Assignment(
-                        property_id=_property.id,
-                        renter_id=renter.id,
-                        price=_property.listed_price,
-                    )
-                )
-
-                assigned_renters.add(renter.id)
-                assigned_properties.add(_property.id)
-
-        return SimulationResult(assignments=assignments)
+        rows, cols = MATCHERS[self.matcher](combined_ranks, self._affordable)
+        self.renter_table.assigned[rows] = cols
+        self.property_table.assigned[cols] = rows
+
+        # Mirror the assignments on the renter and property objects
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            renter = self.renters[i]
+            _property = self.properties[j]
+
+            renter.assigned_property = _property
+            _property.assigned_renter = renter
+            _property.max_possible_price = renter.max_price
+
+        return SimulationResult(
+            property_ids=self.property_table.id[cols],
+            renter_ids=self.renter_table.id[rows],
+            prices=self.property_table.listed_price[cols],
+        )
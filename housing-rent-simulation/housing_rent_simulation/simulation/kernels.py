@@ -0,0 +1,177 @@
+"""Numba kernels of the simulation.
+
+The kernels are compiled eagerly for explicit signatures and cached on disk,
+so only the first import after installation pays for the compilation and
+calls never wait for the JIT.
+"""
+
+import numba as nb
+import numpy as np
+
+
+@nb.njit("int32[:, :](int64[:], boolean[:, :])", cache=True, parallel=True)
+def rank_by_affordability(order: np.ndarray, affordable: np.ndarray) -> np.ndarray:
+    """
+    Rank the renters of every property following a global priority order.
+
+    Each property ranks the renters who can afford it in the order given,
+    so a single sort of the renters serves all properties.
+
+    Args:
+        order: Renter indices from highest to lowest priority
+        affordable: Boolean affordability matrix, shape (renters, properties)
+
+    Returns:
+        Rank of each renter for each property, -1 where it is not affordable
+    """
+    n_renters, n_properties = affordable.shape
+    ranks = np.full((n_renters, n_properties), -1, dtype=np.int32)
+    for j in nb.prange(n_properties):
+        rank = 0
+        for i in order:
+            if affordable[i, j]:
+                ranks[i, j] = rank
+                rank += 1
+    return ranks
+
+
+@nb.njit("int32[:, :](float32[:, :], boolean[:, :])", cache=True, parallel=True)
+def rank_by_score(scores: np.ndarray, affordable: np.ndarray) -> np.ndarray:
+    """
+    Rank the affordable properties of every renter, 0 being the best score.
+
+    Every renter sorts their own row, so the rows are ranked in parallel.
+    Ties keep the property order.
+
+    Args:
+        scores: Score of each property for each renter, shape (renters, properties)
+        affordable: Boolean affordability matrix of the same shape
+
+    Returns:
+        Rank of each property for each renter, -1 where it is not affordable
+    """
+    n_renters, n_properties = scores.shape
+    ranks = np.full((n_renters, n_properties), -1, dtype=np.int32)
+    for i in nb.prange(n_renters):
+        candidates = np.flatnonzero(affordable[i])
+        order = np.argsort(-scores[i][candidates], kind="mergesort")
+        for rank in range(order.size):
+            ranks[i, candidates[order[rank]]] = rank
+    return ranks
+
+
+@nb.njit("int64[:](float32[:], int32[:], int32, int32)", cache=True)
+def affordable_order(
+    scores: np.ndarray, listed_cents: np.ndarray, min_cents: int, max_cents: int
+) -> np.ndarray:
+    """
+    Order the properties a renter can afford from best to worst score.
+
+    Checks the affordability, gathers the candidates and sorts them in a
+    single pass over the properties. Ties keep the property order.
+
+    Args:
+        scores: Score of each property for the renter
+        listed_cents: Listed price of each property in cents
+        min_cents: Minimum price of the renter in cents
+        max_cents: Maximum price of the renter in cents
+
+    Returns:
+        Indices of the affordable properties, best first
+    """
+    candidates = np.empty(scores.size, dtype=np.int64)
+    keys = np.empty(scores.size, dtype=np.float32)
+    k = 0
+    for j in range(scores.size):
+        if min_cents <= listed_cents[j] <= max_cents:
+            candidates[k] = j
+            keys[k] = -scores[j]
+            k += 1
+    order = np.argsort(keys[:k], kind="mergesort")
+    return candidates[:k][order]
+
+
+@nb.njit("UniTuple(int64[:], 2)(int64[:], int64, int64)", cache=True)
+def serial_dictatorship_match(
+    pairs: np.ndarray, n_renters: int, n_properties: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Accept (renter, property) pairs in priority order while both are free.
+
+    Args:
+        pairs: Flat (row-major) index of each candidate pair into the
+            (renters, properties) matrix, highest priority first
+        n_renters: Number of renters
+        n_properties: Number of properties
+
+    Returns:
+        Renter and property indices of the accepted pairs, in acceptance order
+    """
+    taken_renters = np.zeros(n_renters, dtype=np.bool_)
+    taken_properties = np.zeros(n_properties, dtype=np.bool_)
+    max_assignments = min(n_renters, n_properties)
+    assigned_rows = np.empty(max_assignments, dtype=np.int64)
+    assigned_cols = np.empty_like(assigned_rows)
+
+    k = 0
+    for idx in range(pairs.size):
+        # Once either side is exhausted no later pair can be accepted
+        if k == max_assignments:
+            break
+        i = pairs[idx] // n_properties
+        j = pairs[idx] - i * n_properties
+        if not taken_renters[i] and not taken_properties[j]:
+            taken_renters[i] = True
+            taken_properties[j] = True
+            assigned_rows[k] = i
+            assigned_cols[k] = j
+            k += 1
+
+    return assigned_rows[:k], assigned_cols[:k]
+
+
+@nb.njit(
+    "Tuple((int64[:], float64[:]))(float64[:, :], float64[:], int64[:], float64)",
+    cache=True,
+    parallel=True,
+)
+def auction_bids(
+    benefit: np.ndarray, prices: np.ndarray, bidders: np.ndarray, epsilon: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the bid of every bidder of an auction round.
+
+    Every bidder bids for the object with the highest value (benefit minus
+    price), raising its price by the margin over the second best object
+    plus epsilon. The bidders are independent, so they bid in parallel.
+
+    Args:
+        benefit: Benefit of each object for each bidder, shape (n, n)
+        prices: Current price of each object
+        bidders: Indices of the unassigned bidders
+        epsilon: Minimum bid increment
+
+    Returns:
+        Object each bidder bids for and the bid
+    """
+    n_objects = prices.size
+    best = np.empty(bidders.size, dtype=np.int64)
+    bids = np.empty(bidders.size, dtype=np.float64)
+    for b in nb.prange(bidders.size):
+        i = bidders[b]
+        best_j = 0
+        best_value = -np.inf
+        second_value = -np.inf
+        for j in range(n_objects):
+            value = benefit[i, j] - prices[j]
+            if value > best_value:
+                second_value = best_value
+                best_value = value
+                best_j = j
+            elif value > second_value:
+                second_value = value
+        if n_objects == 1:
+            second_value = best_value
+        best[b] = best_j
+        bids[b] = prices[best_j] + best_value - second_value + epsilon
+    return best, bids
@@ -0,0 +1,240 @@
+from typing import Callable
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import maximum_bipartite_matching
+
+from housing_rent_simulation.simulation.kernels import (
+    auction_bids,
+    serial_dictatorship_match,
+)
+
+
+def greedy_match(
+    combined_ranks: np.ndarray, affordable: np.ndarray, oversample: int = 4
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Assign pairs in order of increasing combined rank, skipping taken ones.
+
+    At most min(renters, properties) pairs are accepted, so only the best
+    candidates are sorted, `oversample` times that many at first. When the
+    greedy pass runs out of sorted candidates, the remaining ones between
+    still free renters and properties are processed the same way, with twice
+    as many sorted candidates.
+
+    Args:
+        combined_ranks: Combined rank of each (renter, property) pair
+        affordable: Boolean affordability matrix of the same shape
+        oversample: Initial number of sorted candidates per possible assignment
+
+    Returns:
+        Renter and property indices of the assignments, in assignment order
+
+    Raises:
+        ValueError: If `oversample` is less than 1
+    """
+    if oversample < 1:
+        raise ValueError("oversample must be at least 1")
+    n_renters, n_properties = affordable.shape
+    pairs = np.flatnonzero(affordable)
+    # Unique keys, so that partial sorts agree with a stable sort on the ranks
+    keys = combined_ranks.ravel()[pairs].astype(np.int64) * affordable.size + pairs
+
+    taken_renters = np.zeros(n_renters, dtype=bool)
+    taken_properties = np.zeros(n_properties, dtype=bool)
+    assigned_rows, assigned_cols = [], []
+    n_sorted = min(n_renters, n_properties) * oversample
+    while pairs.size:
+        if pairs.size > n_sorted:
+            partition = np.argpartition(keys, n_sorted - 1)
+            head, rest = partition[:n_sorted], partition[n_sorted:]
+        else:
+            head, rest = np.arange(pairs.size), np.empty(0, dtype=np.intp)
+        head = head[np.argsort(keys[head])]
+        rows, cols = serial_dictatorship_match(pairs[head], n_renters, n_properties)
+        assigned_rows.append(rows)
+        assigned_cols.append(cols)
+
+        # Later candidates can only pair renters and properties still free
+        taken_renters[rows] = True
+        taken_properties[cols] = True
+        pairs, keys = pairs[rest], keys[rest]
+        free = (
+            ~taken_renters[pairs // n_properties]
+            & ~taken_properties[pairs % n_properties]
+        )
+        pairs, keys = pairs[free], keys[free]
+        n_sorted *= 2
+
+    if not assigned_rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(assigned_rows), np.concatenate(assigned_cols)
+
+
+def build_cost_matrix(combined_ranks: np.ndarray, affordable: np.ndarray) -> np.ndarray:
+    """
+    Build a finite cost matrix for the assignment solver.
+
+    Unaffordable pairs get a cost larger than any sum of affordable pair
+    costs, so the solver only uses them when no affordable pair is left.
+
+    Args:
+        combined_ranks: Combined rank of each (renter, property) pair
+        affordable: Boolean affordability matrix of the same shape
+
+    Returns:
+        Cost matrix of the same shape as `combined_ranks`
+    """
+    infeasible_cost = _infeasible_cost(affordable.shape)
+    return np.where(affordable, combined_ranks, infeasible_cost).astype(np.float64)
+
+
+def _infeasible_cost(shape: tuple[int, ...]) -> int:
+    """Get a cost exceeding the total combined rank of any matching."""
+    n_renters, n_properties = shape
+    return min(n_renters, n_properties) * (n_renters + n_properties) + 1
+
+
+def _feasible_submatrix(
+    combined_ranks: np.ndarray, affordable: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Drop the renters and properties without any affordable pair.
+
+    They can never be assigned, so removing them shrinks the problem
+    handed to the solvers without changing the solution.
+
+    Args:
+        combined_ranks: Combined rank of each (renter, property) pair
+        affordable: Boolean affordability matrix of the same shape
+
+    Returns:
+        Combined ranks and affordability of the remaining pairs, and the
+        original indices of the remaining renters and properties
+    """
+    renters = np.flatnonzero(affordable.any(axis=1))
+    properties = np.flatnonzero(affordable.any(axis=0))
+    keep = np.ix_(renters, properties)
+    return combined_ranks[keep], affordable[keep], renters, properties
+
+
+def min_cost_match(
+    combined_ranks: np.ndarray, affordable: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Assign pairs minimizing the total combined rank (Jonker-Volgenant).
+
+    Args:
+        combined_ranks: Combined rank of each (renter, property) pair
+        affordable: Boolean affordability matrix of the same shape
+
+    Returns:
+        Renter and property indices of the assignments
+    """
+    combined_ranks, affordable, renters, properties = _feasible_submatrix(
+        combined_ranks, affordable
+    )
+    rows, cols = linear_sum_assignment(build_cost_matrix(combined_ranks, affordable))
+    feasible = affordable[rows, cols]
+    return renters[rows[feasible]], properties[cols[feasible]]
+
+
+def max_cardinality_match(
+    combined_ranks: np.ndarray, affordable: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Assign as many affordable pairs as possible, ignoring the ranks.
+
+    Uses the Hopcroft-Karp implementation of scipy on the sparse
+    affordability graph.
+
+    Args:
+        combined_ranks: Combined rank of each (renter, property) pair (unused)
+        affordable: Boolean affordability matrix
+
+    Returns:
+        Renter and property indices of the assignments
+    """
+    perm = maximum_bipartite_matching(csr_matrix(affordable), perm_type="column")
+    rows = np.flatnonzero(perm >= 0)
+    return rows, perm[rows].astype(np.int64)
+
+
+def auction_match(
+    combined_ranks: np.ndarray, affordable: np.ndarray, scaling: float = 4.0
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Assign pairs minimizing the total combined rank with the auction algorithm.
+
+    Renters bid for properties in parallel (Jacobi auction) with epsilon
+    scaling, the bids being computed by a parallel kernel. The problem is
+    padded to a square one with dummy renters and properties of zero benefit;
+    a renter left with a dummy or unaffordable property stays unassigned.
+    Since the benefits are integers, the final phase with epsilon < 1/n
+    yields an optimal assignment.
+
+    Args:
+        combined_ranks: Combined rank of each (renter, property) pair
+        affordable: Boolean affordability matrix of the same shape
+        scaling: Factor by which epsilon shrinks between phases
+
+    Returns:
+        Renter and property indices of the assignments
+    """
+    combined_ranks, affordable, renters, properties = _feasible_submatrix(
+        combined_ranks, affordable
+    )
+    n_renters, n_properties = affordable.shape
+    n = max(n_renters, n_properties)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Benefit of an assignment, so that maximizing the total benefit first
+    # maximizes the number of affordable assignments, then minimizes the ranks
+    benefit = np.zeros((n, n))
+    benefit[:n_renters, :n_properties] = np.where(
+        affordable, _infeasible_cost(affordable.shape) - combined_ranks, 0
+    )
+
+    prices = np.zeros(n)
+    epsilon = max(benefit.max(), 1.0) / scaling
+    while True:
+        owner = np.full(n, -1)
+        assigned = np.full(n, -1)
+        while (bidders := np.flatnonzero(assigned < 0)).size:
+            best, bids = auction_bids(benefit, prices, bidders, epsilon)
+
+            # Every property goes to its highest bidder
+            winning_bids = np.full(n, -np.inf)
+            np.maximum.at(winning_bids, best, bids)
+            is_winner = bids == winning_bids[best]
+            won, first = np.unique(best[is_winner], return_index=True)
+            winners = bidders[is_winner][first]
+
+            previous_owners = owner[won]
+            assigned[previous_owners[previous_owners >= 0]] = -1
+            owner[won] = winners
+            assigned[winners] = won
+            prices[won] = winning_bids[won]
+
+        if epsilon < 1.0 / n:
+            break
+        epsilon /= scaling
+
+    rows = np.arange(n_renters)
+    cols = assigned[:n_renters]
+    real = cols < n_properties
+    rows, cols = rows[real], cols[real]
+    feasible = affordable[rows, cols]
+    return renters[rows[feasible]], properties[cols[feasible]]
+
+
+MATCHERS: dict[
+    str, Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]
+] = {
+    "greedy": greedy_match,
+    "hungarian": min_cost_match,
+    "max_cardinality": max_cardinality_match,
+    "auction": auction_match,
+}
@@ -1,17 +1,55 @@
+import numpy as np
+
 from housing_rent_simulation.simulation.base import BaseSimulation
 from housing_rent_simulation.models.renter import Renter
 from housing_rent_simulation.models.property import Property
+from housing_rent_simulation.models.tables import precompute_observed_prices
 from housing_rent_simulation.constants import MIN_RENT, MAX_RENT, LANDLORD_WEIGHT
 
 
+def price_score(prices: np.ndarray, landlord_quality: np.ndarray) -> np.ndarray:
+    """
+    Score properties by their price alone.
+
+    Args:
+        prices: Prices of the properties as seen by the renters
+        landlord_quality: Landlord quality of the properties (unused)
+
+    Returns:
+        The prices themselves
+    """
+    return prices
+
+
+def landlord_score(prices: np.ndarray, landlord_quality: np.ndarray) -> np.ndarray:
+    """
+    Score properties by the weighted landlord quality plus the normalized price.
+
+    Args:
+        prices: Prices of the properties as seen by the renters
+        landlord_quality: Landlord quality of the properties
+
+    Returns:
+        Scores broadcast from the shapes of the inputs
+    """
+    return LANDLORD_WEIGHT * landlord_quality + (prices - MIN_RENT) / (
+        MAX_RENT - MIN_RENT
+    )
+
+
 class NoisyFairPriceSimulation(BaseSimulation):
     """Simulation where renters see a noisy estimate of the fair price."""
 
+    score_fn = staticmethod(price_score)
+
     def __init__(
         self,
         renters: list[Renter],
         properties: list[Property],
         noise_level: float = 0.1,
+        matcher: str = "hungarian",
+        rng: np.random.Generator | None = None,
+        affordable: np.ndarray | None = None,
     ):
         """
         Initialize the simulation with noise level.
@@ -20,57 +58,39 @@ class NoisyFairPriceSimulation(BaseSimulation):
             renters: list of renters in the simulation
             properties: list of properties in the simulation
             noise_level: Standard deviation of the noise as a fraction of fair price
+            matcher: Name of the matching algorithm, one of `MATCHERS`
+            rng: Random number generator for the price noise
+            affordable: Precomputed affordability matrix, computed if not given
         """
-        super().__init__(renters, properties)
+        super().__init__(
+            renters, properties, matcher=matcher, rng=rng, affordable=affordable
+        )
         self.noise_level = noise_level
+        # Every renter observes every property once, with independent noise
+        self.observed_price_matrix = precompute_observed_prices(
+            self.property_table, noise_level, self.rng, n_draws=len(renters)
+        )
 
-    def _get_scored_property(
-        self, renter: Renter, _property: Property
-    ) -> tuple[float, Property]:
+    def _observed_prices(self) -> np.ndarray:
         """
-        Get the scored property for a given renter.
+        Get the noisy prices observed by every renter.
         """
-        return _property.get_observed_price(self.noise_level), _property
+        return self.observed_price_matrix
 
 
 class ActualFairPriceSimulation(BaseSimulation):
     """Simulation where renters see the actual fair price."""
 
-    def _get_scored_property(
-        self, renter: Renter, _property: Property
-    ) -> tuple[float, Property]:
-        """
-        Get the scored property for a given renter.
-        """
-        return _property.fair_price, _property
+    score_fn = staticmethod(price_score)
 
 
 class NoisyFairPriceWithLandlordScoreSimulation(NoisyFairPriceSimulation):
     """Simulation where renters see noisy fair price and landlord quality score."""
 
-    def _get_scored_property(
-        self, renter: Renter, _property: Property
-    ) -> tuple[float, Property]:
-        """
-        Get the scored property for a given renter.
-        """
-        noisy_fair_price = _property.get_observed_price(self.noise_level)
-        landlord_score = LANDLORD_WEIGHT * _property.landlord_quality + (
-            noisy_fair_price - MIN_RENT
-        ) / (MAX_RENT - MIN_RENT)
-        return landlord_score, _property
+    score_fn = staticmethod(landlord_score)
 
 
 class ActualFairPriceWithLandlordScoreSimulation(ActualFairPriceSimulation):
     """Simulation where renters see actual fair price and landlord quality score."""
 
-    def _get_scored_property(
-        self, renter: Renter, _property: Property
-    ) -> tuple[float, Property]:
-        """
-        Get the scored property for a given renter.
-        """
-        landlord_score = LANDLORD_WEIGHT * _property.landlord_quality + (
-            _property.fair_price - MIN_RENT
-        ) / (MAX_RENT - MIN_RENT)
-        return landlord_score, _property
+    score_fn = staticmethod(landlord_score)
@@ -1,6 +1,14 @@
+import numpy as np
 import pytest
 from housing_rent_simulation.models.renter import Renter
 from housing_rent_simulation.models.property import Property
+from housing_rent_simulation.models.tables import (
+    PropertyTable,
+    RenterTable,
+    affordable_mask,
+    precompute_observed_prices,
+)
+from housing_rent_simulation.models.prices import MAX_CENTS, to_cents
 
 
 def test_renter_creation():
@@ -56,6 +64,25 @@ def test_property_validation():
         Property(id=1, fair_price=1500, listed_price=-100, landlord_quality=0.9)
 
 
+def test_property_validate_batch():
+    """Test validating property attributes as arrays."""
+    fair_price = np.array([1500.0, 2000.0])
+    listed_price = np.array([1600.0, 2100.0])
+
+    Property.validate_batch(fair_price, listed_price, np.array([0.0, 1.0]))
+
+    with pytest.raises(ValueError):
+        Property.validate_batch(fair_price, listed_price, np.array([0.5, 1.5]))
+
+    with pytest.raises(ValueError):
+        Property.validate_batch(fair_price, -listed_price, np.array([0.5, 0.5]))
+
+    # Already validated attributes are not checked again
+    Property(
+        id=1, fair_price=1500, listed_price=1600, landlord_quality=1.5, validate=False
+    )
+
+
 def test_property_assignment():
     """Test property assignment to renters."""
     property = Property(id=1, fair_price=1500, listed_price=1600, landlord_quality=0.9)
@@ -85,3 +112,138 @@ def test_property_observed_price():
     assert observed_price != 1500
     # The noise should be within reasonable bounds
     assert 1350 <= observed_price <= 1650
+
+
+def test_tables_from_list():
+    """Test stacking renters and properties into column tables."""
+    renters = [
+        Renter(id=1, min_price=1000, max_price=2000, income=5000, job_stability=0.8),
+        Renter(id=2, min_price=1500, max_price=2500, income=6000, job_stability=0.9),
+    ]
+    properties = [
+        Property(id=1, fair_price=1500, listed_price=1600, landlord_quality=0.9),
+    ]
+
+    renter_table = RenterTable.from_list(renters)
+    property_table = PropertyTable.from_list(properties)
+
+    assert len(renter_table) == 2
+    assert len(property_table) == 1
+    np.testing.assert_array_equal(renter_table.id, [1, 2])
+    np.testing.assert_array_equal(renter_table.max_price, [2000, 2500])
+    np.testing.assert_array_equal(property_table.listed_price, [1600])
+    np.testing.assert_array_equal(renter_table.index_of(np.array([2, 1, 2])), [1, 0, 1])
+
+
+def test_index_of_sparse_ids():
+    """Test looking up rows of ids far from 0..N-1."""
+    properties = PropertyTable.from_list(
+        [
+            Property(id=50, fair_price=1500, listed_price=1600, landlord_quality=0.9),
+            Property(id=7, fair_price=2000, listed_price=2100, landlord_quality=0.8),
+            Property(id=1000, fair_price=1200, listed_price=1300, landlord_quality=0.7),
+        ]
+    )
+
+    np.testing.assert_array_equal(
+        properties.index_of(np.array([1000, 50, 7])), [2, 0, 1]
+    )
+    assert properties.index_of(7) == 1
+    for unknown in (8, -7, 2000, [7, 51]):
+        with pytest.raises(KeyError):
+            properties.index_of(unknown)
+
+
+def test_index_of_unknown_dense_ids():
+    """Test unknown ids raise instead of wrapping around to other rows."""
+    renter_table = RenterTable.from_list(
+        [
+            Renter(id=i, min_price=500, max_price=900, income=1500, job_stability=1)
+            for i in (0, 1, 3)
+        ]
+    )
+
+    np.testing.assert_array_equal(renter_table.index_of([3, 0]), [2, 0])
+    for unknown in (2, -1, 4, 100, [0, 2]):
+        with pytest.raises(KeyError):
+            renter_table.index_of(unknown)
+
+
+def test_renter_table_attractiveness():
+    """Test the cached attractiveness score of renters."""
+    renters = RenterTable.from_list(
+        [
+            Renter(id=1, min_price=500, max_price=500, income=1500, job_stability=0.5),
+            Renter(id=2, min_price=500, max_price=500, income=30000, job_stability=1),
+        ]
+    )
+
+    np.testing.assert_allclose(renters.attractiveness, [0.5, 4.0])
+    assert renters.priority.tolist() == [1, 0]
+
+
+def test_affordable_mask():
+    """Test the affordability matrix matches Renter.can_afford."""
+    renter = Renter(
+        id=1, min_price=1000, max_price=2000, income=50000, job_stability=0.8
+    )
+    prices = np.array([500, 1000, 1500, 2000, 2500])
+
+    mask = affordable_mask(np.array([1000, 2100]), np.array([2000, 3000]), prices)
+
+    assert mask.shape == (2, 5)
+    assert mask[0].tolist() == [renter.can_afford(p) for p in prices]
+    assert mask[1].tolist() == [False, False, False, False, True]
+    assert affordable_mask(1000, 2000, prices).tolist() == mask[0].tolist()
+    cents_mask = affordable_mask(to_cents(1000), to_cents(2000), to_cents(prices))
+    assert cents_mask.tolist() == mask[0].tolist()
+    assert to_cents(12.345).dtype == np.int32
+
+
+def test_to_cents_boundaries():
+    """Test cents saturate for huge and infinite prices and reject NaN."""
+    assert to_cents(2e7) == 2_000_000_000
+    assert to_cents(2.2e7) == MAX_CENTS
+    assert to_cents(np.inf) == MAX_CENTS
+    assert to_cents(-np.inf) == -MAX_CENTS
+    with pytest.raises(ValueError):
+        to_cents(np.array([1000.0, np.nan]))
+
+    # An unbounded renter can afford any listed price
+    unbounded = Renter(
+        id=1, min_price=0, max_price=np.inf, income=30000, job_stability=1
+    )
+    assert unbounded.can_afford(1e12)
+    assert affordable_mask(to_cents(0), to_cents(np.inf), to_cents([1e7]))[0]
+
+
+def test_renter_can_afford_float_bounds():
+    """Test Renter.can_afford compares the exact prices."""
+    renter = Renter(id=1, min_price=1000, max_price=2000, income=30000, job_stability=1)
+    assert renter.can_afford(2000) is True
+    assert renter.can_afford(2000.004) is False
+    assert renter.can_afford(999.996) is False
+
+    unknown = Renter(
+        id=2, min_price=1000, max_price=np.nan, income=30000, job_stability=1
+    )
+    assert unknown.can_afford(1500) is False
+
+
+def test_precompute_observed_prices():
+    """Test the batched observed price draw."""
+    properties = PropertyTable.from_list(
+        [
+            Property(id=1, fair_price=1500, listed_price=1600, landlord_quality=0.9),
+            Property(id=2, fair_price=2000, listed_price=2100, landlord_quality=0.8),
+        ]
+    )
+    rng = np.random.default_rng(0)
+
+    np.testing.assert_array_equal(
+        precompute_observed_prices(properties, 0.0, rng), [1500, 2000]
+    )
+
+    observed_prices = precompute_observed_prices(properties, 0.1, rng)
+    assert observed_prices.shape == (2,)
+    assert not np.array_equal(observed_prices, properties.fair_price)
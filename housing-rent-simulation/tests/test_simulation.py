@@ -1,4 +1,6 @@
+import numpy as np
 import pytest
+from scipy.stats import rankdata
 from housing_rent_simulation.models.renter import Renter
 from housing_rent_simulation.models.property import Property
 from housing_rent_simulation.simulation.scenarios import (
@@ -7,6 +9,19 @@ from housing_rent_simulation.simulation.scenarios import (
     NoisyFairPriceWithLandlordScoreSimulation,
     ActualFairPriceWithLandlordScoreSimulation,
 )
+from housing_rent_simulation.simulation.kernels import (
+    affordable_order,
+    auction_bids,
+    rank_by_affordability,
+    rank_by_score,
+    serial_dictatorship_match,
+)
+from housing_rent_simulation.simulation.matching import (
+    auction_match,
+    greedy_match,
+    max_cardinality_match,
+    min_cost_match,
+)
 
 
 @pytest.fixture
@@ -99,3 +114,248 @@ def test_simulation_comparison(sample_renters, sample_properties):
     # (since they have perfect information)
     assert results[1].total_revenue >= results[0].total_revenue
     assert results[3].total_revenue >= results[2].total_revenue
+
+
+def reference_ranks(scores: np.ndarray, affordable: np.ndarray) -> np.ndarray:
+    """Rank the affordable properties of every renter with scipy, -1 elsewhere."""
+    keys = np.where(affordable, -scores, np.inf)
+    ranks = rankdata(keys, method="ordinal", axis=1) - 1
+    return np.where(affordable, ranks, -1)
+
+
+def test_rank_by_score():
+    """Test ranking properties per renter from a score matrix."""
+    scores = np.array([[3.0, 1.0, 2.0], [1.0, 1.0, 5.0]], dtype=np.float32)
+    affordable = np.array([[True, True, True], [True, True, False]])
+
+    ranks = rank_by_score(scores, affordable)
+
+    assert ranks.tolist() == [[0, 2, 1], [0, 1, -1]]
+
+
+def test_rank_by_score_matches_reference():
+    """Test the parallel ranking kernel agrees with a scipy ranking."""
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 5, size=(6, 8)).astype(np.float32)
+    affordable = rng.random((6, 8)) < 0.6
+
+    ranks = rank_by_score(scores, affordable)
+
+    assert ranks.dtype == np.int32
+    np.testing.assert_array_equal(ranks, reference_ranks(scores, affordable))
+
+
+def test_property_ranks_match_ranked_properties(sample_renters, sample_properties):
+    """Test the matrix ranking agrees with the per-renter ranking."""
+    simulation = ActualFairPriceWithLandlordScoreSimulation(
+        sample_renters, sample_properties
+    )
+    ranks = simulation._get_property_ranks()
+
+    assert ranks.dtype == np.int32
+    for i, renter in enumerate(sample_renters):
+        for rank, _property in enumerate(simulation.get_ranked_properties(renter)):
+            assert ranks[i, sample_properties.index(_property)] == rank
+
+
+def test_min_cost_match_beats_greedy():
+    """Test the assignment solver never does worse than the greedy pass."""
+    combined_ranks = np.array([[0, 1], [1, 3]])
+    affordable = np.ones((2, 2), dtype=bool)
+
+    greedy_rows, greedy_cols = greedy_match(combined_ranks, affordable)
+    rows, cols = min_cost_match(combined_ranks, affordable)
+
+    assert sorted(zip(greedy_rows.tolist(), greedy_cols.tolist())) == [(0, 0), (1, 1)]
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(0, 1), (1, 0)]
+    assert (
+        combined_ranks[rows, cols].sum()
+        < combined_ranks[greedy_rows, greedy_cols].sum()
+    )
+
+
+def test_default_matcher_is_optimal(sample_renters, sample_properties):
+    """Test the simulations match optimally unless greedy is asked for."""
+    simulation = ActualFairPriceSimulation(sample_renters, sample_properties)
+    greedy = ActualFairPriceSimulation(
+        sample_renters, sample_properties, matcher="greedy"
+    )
+
+    def total_rank(sim):
+        result = sim.match_renters_to_properties()
+        rows = sim.renter_table.index_of(result.renter_ids)
+        cols = sim.property_table.index_of(result.property_ids)
+        combined_ranks = sim._get_property_ranks() + sim._get_renter_ranks()
+        return combined_ranks[rows, cols].sum()
+
+    assert simulation.matcher == "hungarian"
+    assert total_rank(simulation) <= total_rank(greedy)
+
+
+def test_greedy_match_partial_sort():
+    """Test the greedy pass does not depend on how many pairs are presorted."""
+    rng = np.random.default_rng(0)
+    combined_ranks = rng.integers(0, 4, size=(10, 7))
+    affordable = rng.random((10, 7)) < 0.5
+
+    rows, cols = greedy_match(combined_ranks, affordable, oversample=1)
+    full_rows, full_cols = greedy_match(combined_ranks, affordable, oversample=70)
+
+    np.testing.assert_array_equal(rows, full_rows)
+    np.testing.assert_array_equal(cols, full_cols)
+    with pytest.raises(ValueError):
+        greedy_match(combined_ranks, affordable, oversample=0)
+
+
+def test_min_cost_match_skips_unaffordable():
+    """Test the assignment solver never returns unaffordable pairs."""
+    combined_ranks = np.zeros((3, 2), dtype=np.int64)
+    affordable = np.array([[True, False], [True, False], [False, False]])
+
+    rows, cols = min_cost_match(combined_ranks, affordable)
+
+    assert len(rows) == 1
+    assert affordable[rows, cols].all()
+
+
+def test_auction_match_is_optimal():
+    """Test the auction algorithm agrees with the assignment solver."""
+    rng = np.random.default_rng(0)
+    combined_ranks = rng.integers(0, 20, size=(12, 9))
+    affordable = rng.random((12, 9)) < 0.4
+
+    rows, cols = auction_match(combined_ranks, affordable)
+    expected_rows, expected_cols = min_cost_match(combined_ranks, affordable)
+
+    assert affordable[rows, cols].all()
+    assert len(set(cols.tolist())) == len(cols)
+    assert len(rows) == len(expected_rows)
+    assert (
+        combined_ranks[rows, cols].sum()
+        == combined_ranks[expected_rows, expected_cols].sum()
+    )
+
+
+def test_max_cardinality_match():
+    """Test the cardinality matching assigns as many renters as possible."""
+    affordable = np.array([[True, True], [True, False], [False, False]])
+
+    rows, cols = max_cardinality_match(np.zeros((3, 2)), affordable)
+
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(0, 1), (1, 0)]
+
+
+def test_kernels_are_precompiled():
+    """Test every kernel is compiled at import for fixed signatures."""
+    for kernel in (
+        rank_by_affordability,
+        rank_by_score,
+        affordable_order,
+        serial_dictatorship_match,
+        auction_bids,
+    ):
+        assert kernel.signatures, kernel.__name__
+
+    # No other specializations are compiled on demand
+    with pytest.raises(TypeError):
+        affordable_order(
+            np.zeros(2, dtype=np.float32), np.zeros(2, dtype=np.int64), 0, 1
+        )
+
+
+def test_affordable_order():
+    """Test ordering the affordable properties of a renter by score."""
+    scores = np.array([0.5, 0.9, 0.5, 0.7], dtype=np.float32)
+    listed_cents = np.array([100000, 150000, 120000, 300000], dtype=np.int32)
+
+    order = affordable_order(scores, listed_cents, 100000, 200000)
+
+    assert order.tolist() == [1, 0, 2]
+
+
+def test_rank_by_affordability():
+    """Test ranking the eligible renters of every property."""
+    order = np.array([2, 0, 1])
+    affordable = np.array([[True, True], [True, False], [False, True]])
+
+    ranks = rank_by_affordability(order, affordable)
+
+    assert ranks.tolist() == [[0, 1], [1, -1], [-1, 0]]
+
+
+def test_noisy_simulation_observes_prices_once(sample_renters, sample_properties):
+    """Test each renter keeps the same noisy observation within a simulation."""
+    simulation = NoisyFairPriceWithLandlordScoreSimulation(
+        sample_renters, sample_properties, noise_level=0.5
+    )
+
+    assert simulation.observed_price_matrix.shape == (3, 3)
+    assert simulation._get_property_ranks() is simulation._get_property_ranks()
+    for renter in sample_renters:
+        ranked = simulation.get_ranked_properties(renter)
+        assert ranked == simulation.get_ranked_properties(renter)
+
+
+def test_average_rank(sample_renters, sample_properties):
+    """Test the average rank of each property over the renters affording it."""
+    simulation = ActualFairPriceSimulation(sample_renters, sample_properties)
+
+    average_ranks = simulation.get_average_rank()
+
+    assert average_ranks.shape == (3,)
+    for j, _property in enumerate(sample_properties):
+        ranks = [
+            simulation.get_ranked_properties(renter).index(_property)
+            for renter in sample_renters
+            if renter.can_afford(_property.listed_price)
+        ]
+        assert average_ranks[j] == pytest.approx(np.mean(ranks), rel=1e-5)
+
+
+def test_shared_affordability_matrix(sample_renters, sample_properties):
+    """Test scenarios accept a precomputed affordability matrix."""
+    simulation = ActualFairPriceSimulation(sample_renters, sample_properties)
+    shared = ActualFairPriceWithLandlordScoreSimulation(
+        sample_renters, sample_properties, affordable=simulation._affordable
+    )
+
+    assert shared._affordable is simulation._affordable
+
+    with pytest.raises(ValueError):
+        ActualFairPriceSimulation(
+            sample_renters, sample_properties, affordable=np.ones((2, 2), dtype=bool)
+        )
+
+
+def test_assignments_recorded_in_tables(sample_renters, sample_properties):
+    """Test the tables and the objects agree on the assignments."""
+    simulation = ActualFairPriceSimulation(sample_renters, sample_properties)
+
+    result = simulation.match_renters_to_properties()
+
+    renter_table = simulation.renter_table
+    property_table = simulation.property_table
+    assert (renter_table.assigned >= 0).sum() == len(result.assignments)
+    for i, renter in enumerate(sample_renters):
+        j = renter_table.assigned[i]
+        if j < 0:
+            assert renter.assigned_property is None
+        else:
+            assert renter.assigned_property is sample_properties[j]
+            assert property_table.assigned[j] == i
+
+
+def test_simulation_result_statistics(sample_renters, sample_properties):
+    """Test the columnar result and its summary statistics."""
+    simulation = ActualFairPriceSimulation(sample_renters, sample_properties)
+
+    result = simulation.match_renters_to_properties()
+
+    prices = [a.price for a in result.assignments]
+    assert result.total_assignments == len(prices) > 0
+    assert result.total_revenue == pytest.approx(sum(prices))
+    assert result.average_price == pytest.approx(np.mean(prices))
+    for assignment in result.assignments:
+        _property = next(p for p in sample_properties if p.id == assignment.property_id)
+        assert _property.assigned_renter.id == assignment.renter_id
+        assert assignment.price == _property.listed_price